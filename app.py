@@ -1,5 +1,6 @@
 import streamlit as st
 import json
+import os
 import random
 from typing import Any
 import datetime
@@ -54,8 +55,8 @@ if not st.session_state.banner_shown:
 # -----------------------------
 # Helpers
 # -----------------------------
-@st.cache_data
-def load_questions(path="questions.json"):
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_questions_cached(path, mtime_ns, size):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -65,30 +66,37 @@ def format_subjective_answer(ans: Any) -> str:
     if isinstance(ans, list):
         return "\n".join(str(x) for x in ans)
     if isinstance(ans, dict):
-        lines = []
-        for k, v in ans.items():
-            lines.append(f"{k}:")
-            if isinstance(v, dict):
-                for kk, vv in v.items():
-                    lines.append(f"  - {kk}: {vv}")
-            elif isinstance(v, list):
-                for item in v:
-                    lines.append(f"  - {item}")
-            else:
-                lines.append(f"  - {v}")
-        return "\n".join(lines)
+        return "\n".join(_dict_answer_lines(ans))
     return str(ans)
 
-def get_subjects_levels(questions):
-    subjects = sorted({q.get("subject", "Unknown") for q in questions})
-    levels = sorted({q.get("level", "Unknown") for q in questions})
-    return subjects, levels
+def _dict_answer_lines(ans: dict):
+    for k, v in ans.items():
+        yield f"{k}:"
+        if isinstance(v, dict):
+            yield from (f"  - {kk}: {vv}" for kk, vv in v.items())
+        elif isinstance(v, list):
+            yield from (f"  - {item}" for item in v)
+        else:
+            yield f"  - {v}"
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _build_index_cached(path, mtime_ns, size):
+    subjects, levels, index = set(), set(), {}
+    for q in _load_questions_cached(path, mtime_ns, size):
+        subjects.add(q.get("subject", "Unknown"))
+        levels.add(q.get("level", "Unknown"))
+        # Bucket on the raw fields so "Unknown" choices match nothing, as the old filter did
+        index.setdefault((q.get("subject"), q.get("level")), []).append(q)
+    return ["-- Select --"] + sorted(subjects), ["-- Select --"] + sorted(levels), index
+
+def load_index(path="questions.json"):
+    # Subject/level selectbox choices and a (subject, level) -> questions lookup, built once per file version
+    stat = os.stat(path)
+    return _build_index_cached(path, stat.st_mtime_ns, stat.st_size)
 
 # -----------------------------
-# Load data & init session
+# Init session
 # -----------------------------
-questions = load_questions()
-
 if "q_index" not in st.session_state:
     st.session_state.q_index = 0
 if "answers" not in st.session_state:
@@ -97,6 +105,12 @@ if "temp_answers" not in st.session_state:
     st.session_state.temp_answers = {}
 if "filtered" not in st.session_state:
     st.session_state.filtered = []
+if "option_cache" not in st.session_state:
+    st.session_state.option_cache = {}
+if "model_answers" not in st.session_state:
+    st.session_state.model_answers = {}
+if "attempted" not in st.session_state:
+    st.session_state.attempted = set()
 if "mode" not in st.session_state:
     st.session_state.mode = "menu"  # menu, practice, exam_of_day, mock_exam
 
@@ -108,36 +122,62 @@ def reset_quiz(filtered_questions):
     st.session_state.q_index = 0
     st.session_state.answers = {}
     st.session_state.temp_answers = {}
+    st.session_state.attempted = set()
+    st.session_state.option_cache = {}
+    st.session_state.model_answers = {}
     st.session_state.show_results = False
 
-def pick_mock_exam(q_list, count):
+def back_to_menu():
+    reset_quiz([])
+    st.session_state.mode = "menu"
+
+def pick_mock_exam(q_list, count, rng=random):
     if len(q_list) < count:
         count = len(q_list)
-    return random.sample(q_list, count)
+    return rng.sample(q_list, count)
+
+@st.cache_data(show_spinner=False, ttl=60 * 60 * 24)
+def _daily_exam_cached(today, path, mtime_ns, size):
+    # A private RNG keeps the daily pick deterministic without reseeding the global one
+    return pick_mock_exam(_load_questions_cached(path, mtime_ns, size), 20, random.Random(today))
 
-def get_daily_exam():
-    today = datetime.date.today().strftime("%Y-%m-%d")
-    random.seed(today)
-    return pick_mock_exam(questions, 20)
+def get_daily_exam(path="questions.json"):
+    today = datetime.date.today().isoformat()
+    stat = os.stat(path)
+    return _daily_exam_cached(today, path, stat.st_mtime_ns, stat.st_size)
 
 def save_current_temp():
     q_idx = st.session_state.q_index
     q = st.session_state.filtered[q_idx]
     key_temp = f"temp_{q_idx}"
-    temp_val = st.session_state.temp_answers.get(key_temp, None)
+    # Form values are committed to the widget key on submit, before temp_answers is refreshed
+    temp_val = st.session_state.get(key_temp, st.session_state.temp_answers.get(key_temp, None))
+    if temp_val is not None:
+        # Keep the draft in step so it is restored when the user navigates back
+        st.session_state.temp_answers[key_temp] = temp_val
 
     if "options" in q and q.get("options"):
         if temp_val and temp_val != "-- Select --":
             st.session_state.answers[q_idx] = temp_val
+            st.session_state.attempted.add(q_idx)
     else:
         if temp_val is not None:
-            st.session_state.answers[q_idx] = str(temp_val).strip()
+            ans = str(temp_val).strip()
+            st.session_state.answers[q_idx] = ans
+            if ans:
+                st.session_state.attempted.add(q_idx)
+            else:
+                st.session_state.attempted.discard(q_idx)
 
 def go_next():
     save_current_temp()
     if st.session_state.q_index < len(st.session_state.filtered) - 1:
         st.session_state.q_index += 1
 
+def submit_quiz():
+    save_current_temp()
+    st.session_state.show_results = True
+
 def go_prev():
     save_current_temp()
     if st.session_state.q_index > 0:
@@ -153,6 +193,7 @@ if st.session_state.mode == "menu":
     with col1:
         if st.button("📚 Practice Mode"):
             st.session_state.mode = "practice"
+            st.rerun()
     with col2:
         if st.button("⏳ Exam of the Day"):
             filtered_questions = get_daily_exam()
@@ -161,9 +202,11 @@ if st.session_state.mode == "menu":
             else:
                 reset_quiz(filtered_questions)
                 st.session_state.mode = "exam"
+                st.rerun()
     with col3:
         if st.button("📝 Mock Exam Generator"):
             st.session_state.mode = "mock"
+            st.rerun()
     st.stop()
 
 # -----------------------------
@@ -171,23 +214,25 @@ if st.session_state.mode == "menu":
 # -----------------------------
 if st.session_state.mode == "practice":
     st.header("📚 Practice Mode")
-    subjects, levels = get_subjects_levels(questions)
-    sel_subject = st.selectbox("Select Subject", ["-- Select --"] + subjects)
-    sel_level = st.selectbox("Select Level", ["-- Select --"] + levels)
+    subject_choices, level_choices, index = load_index()
+    sel_subject = st.selectbox("Select Subject", subject_choices)
+    sel_level = st.selectbox("Select Level", level_choices)
 
     if st.button("Load Questions"):
         if sel_subject == "-- Select --" or sel_level == "-- Select --":
             st.error("🚫 Please select both Subject and Level.")
         else:
-            filtered_questions = [q for q in questions if q.get("subject") == sel_subject and q.get("level") == sel_level]
+            filtered_questions = index.get((sel_subject, sel_level), [])
             if not filtered_questions:
                 st.error("🚫 No questions found for this subject and level.")
             else:
                 reset_quiz(filtered_questions)
                 st.session_state.mode = "exam"
+                st.rerun()
 
     if st.button("Back to Menu"):
         st.session_state.mode = "menu"
+        st.rerun()
     st.stop()
 
 # -----------------------------
@@ -195,25 +240,27 @@ if st.session_state.mode == "practice":
 # -----------------------------
 if st.session_state.mode == "mock":
     st.header("📝 Mock Exam Generator")
-    subjects, levels = get_subjects_levels(questions)
-    sel_subject = st.selectbox("Select Subject", ["-- Select --"] + subjects)
-    sel_level = st.selectbox("Select Level", ["-- Select --"] + levels)
+    subject_choices, level_choices, index = load_index()
+    sel_subject = st.selectbox("Select Subject", subject_choices)
+    sel_level = st.selectbox("Select Level", level_choices)
     count = st.slider("Number of Questions", 10, 60, 20)
 
     if st.button("Generate Mock Exam"):
         if sel_subject == "-- Select --" or sel_level == "-- Select --":
             st.error("🚫 Please select both Subject and Level.")
         else:
-            base = [q for q in questions if q.get("subject") == sel_subject and q.get("level") == sel_level]
+            base = index.get((sel_subject, sel_level), [])
             if not base:
                 st.error("🚫 No questions available for this selection.")
             else:
                 filtered_questions = pick_mock_exam(base, count)
                 reset_quiz(filtered_questions)
                 st.session_state.mode = "exam"
+                st.rerun()
 
     if st.button("Back to Menu"):
         st.session_state.mode = "menu"
+        st.rerun()
     st.stop()
 
 # -----------------------------
@@ -224,58 +271,62 @@ if not filtered:
     st.info("No questions loaded. Go back to Menu and select a mode.")
     st.stop()
 
-total = len(filtered)
-q_index = st.session_state.q_index
-q = filtered[q_index]
-
-st.progress((q_index + 1) / total)
-st.markdown(f"### Question {q_index + 1} of {total}")
-st.write(q.get("question", ""))
-
-temp_key = f"temp_{q_index}"
-if temp_key not in st.session_state.temp_answers:
-    if q_index in st.session_state.answers:
-        st.session_state.temp_answers[temp_key] = st.session_state.answers[q_index]
-    else:
-        if q.get("options"):
-            st.session_state.temp_answers[temp_key] = "-- Select --"
+@st.fragment
+def render_question():
+    # Navigating between questions only reruns this fragment, not the whole script
+    filtered = st.session_state.filtered
+    total = len(filtered)
+    q_index = st.session_state.q_index
+    q = filtered[q_index]
+    q_options = q.get("options")
+    q_explanation = q.get("explanation")
+
+    st.progress((q_index + 1) * 100 // total)
+    st.markdown(f"### Question {q_index + 1} of {total}")
+    st.write(q.get("question", ""))
+
+    temp_key = f"temp_{q_index}"
+    default = st.session_state.answers.get(q_index, "-- Select --" if q_options else "")
+    st.session_state.temp_answers.setdefault(temp_key, default)
+
+    # Answers live in a form so typing or picking an option doesn't rerun anything until a button is pressed
+    with st.form(f"q_form_{q_index}"):
+        # Objective / Subjective Inputs
+        if q_options:
+            if q_index not in st.session_state.option_cache:
+                opts = ["-- Select --"] + list(q_options)
+                st.session_state.option_cache[q_index] = (opts, {o: i for i, o in enumerate(opts)})
+            options_with_placeholder, option_lookup = st.session_state.option_cache[q_index]
+            current_temp = st.session_state.temp_answers.get(temp_key, "-- Select --")
+            selected_idx = option_lookup.get(current_temp, 0)
+            val = st.radio("Choose an option:", options_with_placeholder, index=selected_idx, key=temp_key)
+            st.session_state.temp_answers[temp_key] = val
         else:
-            st.session_state.temp_answers[temp_key] = st.session_state.answers.get(q_index, "")
-
-# -----------------------------
-# Objective / Subjective Inputs
-# -----------------------------
-if q.get("options"):
-    options_with_placeholder = ["-- Select --"] + list(q["options"])
-    current_temp = st.session_state.temp_answers.get(temp_key, "-- Select --")
-    try:
-        selected_idx = options_with_placeholder.index(current_temp)
-    except ValueError:
-        selected_idx = 0
-    val = st.radio("Choose an option:", options_with_placeholder, index=selected_idx, key=temp_key)
-    st.session_state.temp_answers[temp_key] = val
-else:
-    val = st.text_area("Type your answer here:", value=st.session_state.temp_answers[temp_key], key=temp_key)
-    st.session_state.temp_answers[temp_key] = val
-
-# Explanation toggle
-if q.get("explanation"):
-    if st.checkbox("Show question explanation (optional)", key=f"exp_{q_index}"):
-        st.info(q.get("explanation"))
-
-# -----------------------------
-# Navigation Buttons
-# -----------------------------
-col1, col2, col3 = st.columns([1, 1, 1])
-with col1:
-    st.button("⬅️ Previous", on_click=go_prev, disabled=(q_index == 0))
-with col2:
-    st.button("Next ➡️", on_click=go_next, disabled=(q_index == total - 1))
-with col3:
-    def submit_quiz():
-        save_current_temp()
-        st.session_state.show_results = True
-    st.button("✅ Submit Quiz", on_click=submit_quiz)
+            val = st.text_area("Type your answer here:", value=st.session_state.temp_answers[temp_key], key=temp_key)
+            st.session_state.temp_answers[temp_key] = val
+
+        # Navigation Buttons
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            moved_prev = st.form_submit_button("⬅️ Previous", on_click=go_prev, disabled=(q_index == 0))
+        with col2:
+            moved_next = st.form_submit_button("Next ➡️", on_click=go_next, disabled=(q_index == total - 1))
+        with col3:
+            # Results render outside this fragment, so submitting needs a full app rerun
+            submitted = st.form_submit_button("✅ Submit Quiz")
+    if submitted:
+        submit_quiz()
+        st.rerun()
+    # While results are on screen, navigating must refresh them too
+    if (moved_prev or moved_next) and st.session_state.get("show_results", False):
+        st.rerun()
+
+    # Explanation toggle
+    if q_explanation:
+        if st.checkbox("Show question explanation (optional)", key=f"exp_{q_index}"):
+            st.info(q_explanation)
+
+render_question()
 
 st.markdown("---")
 
@@ -284,7 +335,7 @@ st.markdown("---")
 # -----------------------------
 if st.session_state.get("show_results", False):
     save_current_temp()
-    attempted = [idx for idx, _ in enumerate(filtered) if idx in st.session_state.answers and str(st.session_state.answers[idx]).strip() != ""]
+    attempted = sorted(st.session_state.attempted)
     score = 0
     results = []
     for idx in attempted:
@@ -299,38 +350,36 @@ if st.session_state.get("show_results", False):
             results.append({"index": idx, "question": ques.get("question"), "type": "objective",
                             "your_answer": user_ans, "correct_answer": correct, "explanation": explanation, "is_correct": is_correct})
         else:
+            # Model answers never change during a quiz, so format each one only once
+            model_answer = st.session_state.model_answers.get(idx)
+            if model_answer is None:
+                model_answer = format_subjective_answer(correct) if correct else "No model answer"
+                st.session_state.model_answers[idx] = model_answer
             results.append({"index": idx, "question": ques.get("question"), "type": "subjective",
-                            "your_answer": user_ans, "correct_answer": format_subjective_answer(correct) if correct else "No model answer",
+                            "your_answer": user_ans, "correct_answer": model_answer,
                             "explanation": explanation})
 
     st.header("📊 Quiz Results (attempted questions only)")
     st.subheader(f"Score (objective): {score} / {sum(1 for r in results if r['type']=='objective')}")
     st.write(f"Total attempted questions: {len(results)}")
 
+    # One markdown element per result keeps the results page to a handful of messages
     for i, r in enumerate(results, start=1):
-        st.markdown(f"### Q{i}. {r['question']}")
+        parts = [f"### Q{i}. {r['question']}"]
         if r["type"] == "objective":
             status = "✅ Correct" if r["is_correct"] else "❌ Incorrect"
-            st.markdown(f"- **Your answer:** {r['your_answer']} — {status}")
-            st.markdown(f"- **Correct answer:** {r['correct_answer']}")
-            if r.get("explanation"):
-                st.info(f"Explanation: {r['explanation']}")
+            parts.append(f"- **Your answer:** {r['your_answer']} — {status}\n"
+                         f"- **Correct answer:** {r['correct_answer']}")
         else:
-            st.markdown(f"- **Your answer:** {r['your_answer']}")
-            st.markdown(f"- **Model answer:**\n{r['correct_answer']}")
-            if r.get("explanation"):
-                st.info(f"Explanation: {r['explanation']}")
-        st.markdown("---")
+            parts.append(f"- **Your answer:** {r['your_answer']}\n"
+                         f"- **Model answer:**\n{r['correct_answer']}")
+        if r.get("explanation"):
+            parts.append(f"> Explanation: {r['explanation']}")
+        parts.append("---")
+        st.markdown("\n\n".join(parts))
 
     rc1, rc2 = st.columns(2)
     with rc1:
-        if st.button("🔄 Restart same quiz"):
-            reset_quiz(st.session_state.filtered)
+        st.button("🔄 Restart same quiz", on_click=reset_quiz, args=(st.session_state.filtered,))
     with rc2:
-        if st.button("🔙 Change Subject/Level"):
-            st.session_state.filtered = []
-            st.session_state.q_index = 0
-            st.session_state.answers = {}
-            st.session_state.temp_answers = {}
-            st.session_state.show_results = False
-            st.session_state.mode = "menu"
+        st.button("🔙 Change Subject/Level", on_click=back_to_menu)